@@ -1,11 +1,12 @@
 import pandas as pd
 from smolagents import Tool
 from faiss_setup import MovieFAISS
-from network_setup import MovieGraph
+from network_setup import MovieGraph, normalize_name
 import warnings
 
 warnings.filterwarnings("ignore")
-from typing import List, Dict, Any
+from concurrent.futures import Future
+from typing import List, Dict, Any, Callable, Optional
 
 
 class QueryGraphTool(Tool):
@@ -52,12 +53,23 @@ class QueryMovieIDTool(Tool):
     inputs = {"movie_id": {"type": "integer", "description": "Movie ID to query."}}
     output_type = "object"
 
-    def __init__(self, movie_graph: MovieGraph):
+    def __init__(
+        self,
+        movie_graph: MovieGraph,
+        prefetch_cache: Optional[Dict[int, Future]] = None,
+    ):
         super().__init__()
         self.movie_graph = movie_graph
+        self.prefetch_cache = prefetch_cache if prefetch_cache is not None else {}
 
     def forward(self, movie_id: int) -> Dict[str, Any]:
-        node_data = self.movie_graph.query_movie_id(movie_id)
+        prefetched = self.prefetch_cache.get(movie_id)
+        try:
+            node_data = prefetched.result() if prefetched is not None else None
+        except Exception:
+            node_data = None
+        if node_data is None:
+            node_data = self.movie_graph.query_movie_id(movie_id)
         if not node_data:
             return {"error": f"Movie ID {movie_id} not found"}
         return node_data
@@ -93,6 +105,10 @@ class NearestGraphTool(Tool):
             entity2: Second entity
         """
         try:
+            if isinstance(entity1, str):
+                entity1 = normalize_name(entity1)
+            if isinstance(entity2, str):
+                entity2 = normalize_name(entity2)
             paths = self.movie_graph.all_paths_query(entity1, entity2)
             return paths if paths else []
         except Exception as e:
@@ -118,11 +134,32 @@ class FaissTool(Tool):
         },
     }
     output_type = "array"
-
-    def __init__(self, movie_faiss: MovieFAISS, movies_df: pd.DataFrame):
+    result_columns = (
+        "id",
+        "overview",
+        "original_title",
+        "original_language",
+        "release_date",
+        "budget",
+        "revenue",
+    )
+
+    def __init__(
+        self,
+        movie_faiss: MovieFAISS,
+        movies_df: pd.DataFrame,
+        on_movie_ids: Optional[Callable[[List[int]], None]] = None,
+    ):
         super().__init__()
         self.movie_faiss = movie_faiss
-        self.movies_df = movies_df
+        self.on_movie_ids = on_movie_ids
+        # Keep only the returned columns as plain tuples, not the DataFrame.
+        self._by_id = {
+            row[0]: row
+            for row in movies_df[list(self.result_columns)].itertuples(
+                index=False, name=None
+            )
+        }
 
     def forward(self, retrieval_query: str, top_k: int = 20) -> List[Dict[str, Any]]:
         """
@@ -134,23 +171,14 @@ class FaissTool(Tool):
         """
         try:
             movie_ids = self.movie_faiss.search(retrieval_query, top_k)
+            if self.on_movie_ids:
+                self.on_movie_ids(movie_ids)
+
             results = []
             for movie_id in movie_ids:
-                movie_row = self.movies_df[self.movies_df["id"] == movie_id]
-                if not movie_row.empty:
-                    movie_json = {
-                        k: movie_row.iloc[0].to_dict()[k]
-                        for k in [
-                            "id",
-                            "overview",
-                            "original_title",
-                            "original_language",
-                            "release_date",
-                            "budget",
-                            "revenue",
-                        ]
-                    }
-                    results.append(movie_json)
+                movie_row = self._by_id.get(movie_id)
+                if movie_row:
+                    results.append(dict(zip(self.result_columns, movie_row)))
             return results
         except Exception as e:
             return [{"error": str(e)}]
@@ -178,22 +206,25 @@ class FilterMoviesByPersonTool(Tool):
     }
     output_type = "array"
 
-    def __init__(self, movie_graph: MovieGraph):
+    def __init__(
+        self,
+        movie_graph: MovieGraph,
+        on_movie_ids: Optional[Callable[[List[int]], None]] = None,
+    ):
         super().__init__()
         self.movie_graph = movie_graph
+        self.on_movie_ids = on_movie_ids
 
     def forward(self, person_name: str, movie_ids: list) -> list:
         """Filter movie IDs to only those connected to person"""
-        person_name = person_name.strip().lower()
+        person_name = normalize_name(person_name)
 
-        if person_name not in self.movie_graph.Graph:
+        person_movies = self.movie_graph.person_movies.get(person_name)
+        if person_movies is None:
             return []
 
-        # Get all movies connected to this person
-        person_movies = set()
-        for neighbor in self.movie_graph.Graph.neighbors(person_name):
-            if self.movie_graph.Graph.nodes[neighbor].get("label") == "movie":
-                person_movies.add(neighbor)
-
         # Filter the input movie_ids
-        return [mid for mid in movie_ids if mid in person_movies]
+        filtered_ids = [mid for mid in movie_ids if mid in person_movies]
+        if self.on_movie_ids:
+            self.on_movie_ids(filtered_ids)
+        return filtered_ids
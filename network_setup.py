@@ -1,166 +1,464 @@
 import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
 import ast
+import itertools
+import multiprocessing
+import os
+import pickle
+import sys
 import networkx as nx
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from tqdm.autonotebook import tqdm
 
+# Crew job -> (person-to-movie relation, role, movie-to-person relation);
+# anything else is supporting crew
+_JOB_MAP = {
+    "director": ("DIRECTED_MOVIES", "director", "MOVIE_HAS_DIRECTOR"),
+    "producer": ("PRODUCED_MOVIES", "producer", "MOVIE_HAS_PRODUCER"),
+    "writer": ("WROTE_MOVIES", "writer", "MOVIE_HAS_WRITER"),
+}
+_SUPPORTING_CREW = ("SUPPORTED_MOVIES", "supporting_crew", "MOVIE_HAS_SUPPORTING_CREW")
+
+# movies_metadata.csv columns used by the graph and the FAISS tool
+MOVIE_COLUMNS = [
+    "id",
+    "title",
+    "original_title",
+    "original_language",
+    "overview",
+    "release_date",
+    "genres",
+    "popularity",
+    "vote_average",
+    "budget",
+    "revenue",
+]
+
+# Stringified list-of-dict columns, parsed for the graph build only
+PARSED_COLUMNS = ["keywords", "genres", "cast", "crew"]
+
+# Raw inputs; a graph cache older than any of them is rebuilt
+DATA_FILES = ["movies_metadata.csv", "credits.csv", "keywords.csv"]
+
+# Bump whenever _CACHED_ATTRS or the layout they hold changes; caches with
+# another version are rebuilt instead of loaded
+_CACHE_VERSION = 2
+
+# MovieGraph attributes persisted by save() and restored by load()
+_CACHED_ATTRS = [
+    "Graph",
+    "movies_df",
+    "movie_attrs",
+    "node_label",
+    "person_movies",
+    "_person_roles",
+    "_title_index",
+    "_name_to_id",
+    "_id_to_name",
+]
+
+
+@lru_cache(maxsize=4096)
+def normalize_name(name):
+    """Normalize a query-time entity name the way graph keys are normalized."""
+    return name.strip().lower()
+
+
+@lru_cache(maxsize=None)
+def _norm(name):
+    """Build-time normalize_name that also interns, so repeats share one key."""
+    return sys.intern(normalize_name.__wrapped__(name))
+
+
+def _bi_bounded_paths(G, source, target, max_len):
+    """Simple paths from source to target with at most max_len edges.
+
+    Paths are split at min(len, ceil(max_len / 2)) edges: heads are grown
+    forward from source, tails backward from target, and joined on the node
+    they share, so each path is produced exactly once.
+    """
+    head_len = (max_len + 1) // 2
+    tail_len = max_len // 2
+
+    # Full-length heads, plus shorter ones that already reached the target
+    heads = {}
+    stack = [(source,)]
+    while stack:
+        path = stack.pop()
+        node = path[-1]
+        if node == target or len(path) > head_len:
+            heads.setdefault(node, []).append(path)
+            continue
+        stack.extend(path + (nbr,) for nbr in G.successors(node) if nbr not in path)
+
+    # Tails of any length up to tail_len, keyed by their first node
+    tails = {}
+    stack = [(target,)]
+    while stack:
+        path = stack.pop()
+        node = path[0]
+        tails.setdefault(node, []).append(path)
+        if node == source or len(path) > tail_len:
+            continue
+        stack.extend((nbr,) + path for nbr in G.predecessors(node) if nbr not in path)
+
+    paths = []
+    for middle, middle_heads in heads.items():
+        for tail in tails.get(middle, ()):
+            rest = tail[1:]
+            paths.extend(
+                head + rest for head in middle_heads if not set(head).intersection(rest)
+            )
+    return paths
+
+
+def _read_table(path, columns):
+    """Read CSV columns as strings into Arrow, keeping one row per integer id."""
+    table = pacsv.read_csv(
+        path,
+        parse_options=pacsv.ParseOptions(newlines_in_values=True),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=columns,
+            column_types=dict.fromkeys(columns, pa.string()),
+            strings_can_be_null=True,
+        ),
+    )
+
+    # A few raw rows are malformed; drop non-integer ids and keep the first row
+    # per id, as the merge + drop_duplicates used to
+    table = table.filter(pc.match_substring_regex(table["id"], r"^\d+$"))
+    ids = pc.cast(table["id"], pa.int64())
+    _, first_rows = np.unique(ids.to_numpy(), return_index=True)
+    table = table.set_column(table.schema.get_field_index("id"), "id", ids)
+    return table.take(np.sort(first_rows))
+
 
 class MovieGraph:
-    def __init__(self):
-        self.Graph = nx.MultiDiGraph()
+    def __init__(self, update_graph=False):
+        self.graph_cache_file = "movie_graph.pkl"
+
+        # Path queries are pure functions of the (static) graph and endpoints
+        self._cached_all_paths = lru_cache(maxsize=10_000)(self._all_simple_paths)
+        self._cached_shortest_path = lru_cache(maxsize=10_000)(
+            self._shortest_path_nodes
+        )
 
-        movies = pd.read_csv("movies_metadata.csv", low_memory=False)
-        credits = pd.read_csv("credits.csv")
-        keywords = pd.read_csv("keywords.csv")
+        if (
+            not update_graph
+            and self._cache_is_fresh()
+            and self.load(self.graph_cache_file)
+        ):
+            return
+
+        # One edge per (u, v); parallel relations share its "relations" set
+        self.Graph = nx.DiGraph()
+        self._person_roles: defaultdict[int, set[str]] = defaultdict(set)
+
+        # Movies are keyed by their (non-negative) id; date, genre and person
+        # names get negative vertex ids, name = _id_to_name[~vertex]
+        self._name_to_id: dict[str, int] = {}
+        self._id_to_name: list[str] = []
+
+        # Only the columns used downstream, joined in Arrow and converted to
+        # pandas once, so the raw frames are never materialized in pandas
+        movies = _read_table("movies_metadata.csv", MOVIE_COLUMNS)
+        movies = movies.append_column("row", pa.array(np.arange(movies.num_rows)))
+        joined = (
+            movies.join(
+                _read_table("credits.csv", ["id", "cast", "crew"]),
+                keys="id",
+                join_type="inner",
+            )
+            .join(
+                _read_table("keywords.csv", ["id", "keywords"]),
+                keys="id",
+                join_type="inner",
+            )
+            .sort_by("row")  # Arrow joins do not preserve row order
+            .drop_columns(["row"])
+        )
+        del movies
 
-        movies["id"] = pd.to_numeric(movies["id"], errors="coerce")
-        credits["id"] = pd.to_numeric(credits["id"], errors="coerce")
-        keywords["id"] = pd.to_numeric(keywords["id"], errors="coerce")
+        self.movies_df = joined.to_pandas(split_blocks=True, self_destruct=True)
+        del joined
 
-        self.movies_df = movies.merge(credits, on="id").merge(keywords, on="id")
-        self.movies_df["id"] = self.movies_df["id"].astype(int)
-        self.movies_df = self.movies_df.drop_duplicates(subset=["id"])
-        self.movies_df = self.movies_df.reset_index(drop=True)
+        # Numeric columns are read as strings since a few raw rows are malformed
+        for column in ["popularity", "vote_average", "budget", "revenue"]:
+            self.movies_df[column] = pd.to_numeric(
+                self.movies_df[column], errors="coerce"
+            )
         self.movies_df = self.movies_df.dropna(subset=["release_date"])
 
-        del movies
-        del credits
-        del keywords
+        # Vectorized per-row string work, done once before the row loop; years
+        # repeat across thousands of rows, so they are stored as a categorical
+        self.movies_df["launch_year"] = (
+            self.movies_df["release_date"].str.split("-", n=1).str[0].astype("category")
+        )
+        self.movies_df["title_norm"] = self.movies_df["title"].str.strip().str.lower()
+
+        # Normalized title -> movie ids, so title lookups are a dict hit
+        self._title_index = {}
+        for movie_id, title in zip(
+            self.movies_df["id"].tolist(), self.movies_df["title_norm"].tolist()
+        ):
+            self._title_index.setdefault(title, []).append(movie_id)
+
+        # Parse the stringified list-of-dict columns across worker processes;
+        # literal_eval dominates load time and every row is independent. Workers
+        # never fork: MovieGraph may be built in a thread next to FAISS loading,
+        # and forking a multi-threaded process can deadlock. Like spawn (used
+        # where forkserver is unavailable, e.g. Windows), this needs scripts that
+        # build a MovieGraph to guard it with if __name__ == "__main__".
+        start_method = (
+            "forkserver"
+            if "forkserver" in multiprocessing.get_all_start_methods()
+            else "spawn"
+        )
+        with ProcessPoolExecutor(
+            mp_context=multiprocessing.get_context(start_method)
+        ) as executor:
+            parsed = {
+                column: executor.map(
+                    ast.literal_eval, self.movies_df[column].tolist(), chunksize=1000
+                )
+                for column in PARSED_COLUMNS
+            }
+            for column, values in parsed.items():
+                self.movies_df[column] = list(values)
 
         self.build_graph()
 
+        # The parsed lists of dicts are only needed to build the graph (keyword
+        # names live on in movie_attrs); keeping them would pin ~1M dicts
+        self.movies_df = self.movies_df.drop(columns=PARSED_COLUMNS)
+        self.save(self.graph_cache_file)
+
         # self.movies_df = self.movies_df[:50]  # For testing, limit to first 50 entries
 
     # Build the graph
     def build_graph(self):
-        for _, row in tqdm(self.movies_df.iterrows(), total=self.movies_df.shape[0]):
-            movie_id = int(row["id"])
-            launch_year = row["release_date"].split("-")[0]
-
-            # Add movie node
-            self.Graph.add_node(
-                movie_id,
-                label="movie",
-                title=row["title"].strip().lower(),
-                popularity=row.get("popularity"),
-                vote_average=row.get("vote_average"),
-                overview=row.get("overview"),
-                launch_year=launch_year,
-                keywords=[k["name"] for k in ast.literal_eval(row["keywords"])],
-            )
+        # Movie attributes are stored column-wise, keyed by id; the graph only
+        # carries topology and a label for movie nodes
+        self.movie_attrs = self.movies_df.set_index("id")[
+            ["title_norm", "popularity", "vote_average", "overview", "launch_year"]
+        ].rename(columns={"title_norm": "title"})
+        self.movie_attrs["keywords"] = [
+            [k["name"] for k in keywords] for keywords in self.movies_df["keywords"]
+        ]
+
+        person_movies = defaultdict(set)
+        date_nodes = set()
+        genre_nodes = set()
+        # (u, v) -> relations, so parallel relations collapse into one edge
+        edges = defaultdict(set)
+        # Unordered actor/director pair -> movies they worked on together
+        collaborations = defaultdict(set)
+
+        for row in tqdm(
+            self.movies_df.itertuples(index=False), total=self.movies_df.shape[0]
+        ):
+            movie_id = int(row.id)
+            launch_year = self._vid(row.launch_year)
 
             # Launch Date
-            self.Graph.add_node(launch_year, label="date")
-            self.Graph.add_edge(movie_id, launch_year, relation="MOVIE_RELEASED_ON")
-            self.Graph.add_edge(launch_year, movie_id, relation="YEAR_RELEASED_MOVIES")
+            date_nodes.add(launch_year)
+            edges[(movie_id, launch_year)].add("MOVIE_RELEASED_ON")
+            edges[(launch_year, movie_id)].add("YEAR_RELEASED_MOVIES")
 
             # Genres
-            genres = ast.literal_eval(row["genres"])
-            for g in genres:
-                genre_name = g["name"].strip().lower()
-                self.Graph.add_node(genre_name, label="genre")
-                self.Graph.add_edge(movie_id, genre_name, relation="MOVIE_HAS_GENRE")
-                self.Graph.add_edge(genre_name, movie_id, relation="GENRE_OF_MOVIES")
+            for g in row.genres:
+                genre = self._vid(_norm(g["name"]))
+                genre_nodes.add(genre)
+                edges[(movie_id, genre)].add("MOVIE_HAS_GENRE")
+                edges[(genre, movie_id)].add("GENRE_OF_MOVIES")
 
             # Actors
-            cast = ast.literal_eval(row["cast"])
             actor_nodes = []
-            for c in cast:
-                actor_name = c["name"].strip().lower()
+            for c in row.cast:
+                actor_name = _norm(c["name"])
+                actor = self._vid(actor_name)
+                self._person_roles[actor].add("actor")
 
-                if actor_name not in self.Graph:
-                    self.Graph.add_node(actor_name, label="person", roles={"actor"})
-                else:
-                    self.Graph.nodes[actor_name].setdefault("roles", set()).add("actor")
-
-                self.Graph.add_edge(movie_id, actor_name, relation="MOVIE_HAS_ACTOR")
-                self.Graph.add_edge(actor_name, movie_id, relation="ACTED_IN_MOVIES")
-                actor_nodes.append(actor_name)
+                edges[(movie_id, actor)].add("MOVIE_HAS_ACTOR")
+                edges[(actor, movie_id)].add("ACTED_IN_MOVIES")
+                person_movies[actor_name].add(movie_id)
+                actor_nodes.append(actor)
 
             # Crew
-            crew = ast.literal_eval(row["crew"])
             director_nodes = []
-            for member in crew:
-                job = member["job"].strip().lower()
-                crew_member_name = member["name"].strip().lower()
-
-                if job not in {"director", "producer", "writer"}:
-                    job = "supporting_crew"
-
-                if crew_member_name not in self.Graph:
-                    self.Graph.add_node(crew_member_name, label="person", roles={job})
-                else:
-                    self.Graph.nodes[crew_member_name].setdefault("roles", set()).add(
-                        job
-                    )
+            for member in row.crew:
+                relation, job, movie_relation = _JOB_MAP.get(
+                    _norm(member["job"]), _SUPPORTING_CREW
+                )
+                crew_member_name = _norm(member["name"])
+                crew_member = self._vid(crew_member_name)
+                self._person_roles[crew_member].add(job)
 
                 if job == "director":
-                    director_nodes.append(crew_member_name)
-                    relation = "DIRECTED_MOVIES"
-                elif job == "producer":
-                    relation = "PRODUCED_MOVIES"
-                elif job == "writer":
-                    relation = "WROTE_MOVIES"
-                else:
-                    relation = "SUPPORTED_MOVIES"
-
-                self.Graph.add_edge(
-                    movie_id, crew_member_name, relation=f"MOVIE_HAS_{job.upper()}"
-                )
-                self.Graph.add_edge(crew_member_name, movie_id, relation=relation)
+                    director_nodes.append(crew_member)
+
+                edges[(movie_id, crew_member)].add(movie_relation)
+                edges[(crew_member, movie_id)].add(relation)
+                person_movies[crew_member_name].add(movie_id)
+
+            # Deduplicated so repeated credits in one movie add no extra edges
+            for a, d in itertools.product(
+                dict.fromkeys(actor_nodes), dict.fromkeys(director_nodes)
+            ):
+                edges[(a, d)].add("ACTOR_WORKED_WITH_DIRECTOR")
+                edges[(d, a)].add("DIRECTOR_WORKED_WITH_ACTOR")
+                pair = (a, d) if a <= d else (d, a)
+                collaborations[pair].add(movie_id)
+
+        # Single bulk insert; the buffer is keyed by edge so it never outgrows the graph
+        self.Graph.add_nodes_from(self.movie_attrs.index.tolist(), label="movie")
+        self.Graph.add_edges_from(
+            (u, v, {"relations": relations}) for (u, v), relations in edges.items()
+        )
+        # A pair's collaboration edges share one movies set in both directions
+        for (u, v), movies in collaborations.items():
+            self.Graph[u][v]["movies"] = movies
+            self.Graph[v][u]["movies"] = movies
+        self.Graph.add_nodes_from(date_nodes, label="date")
+        self.Graph.add_nodes_from(genre_nodes, label="genre")
+
+        # Person nodes were created by add_edge; attach attributes once per person
+        nx.set_node_attributes(
+            self.Graph, dict.fromkeys(self._person_roles, "person"), "label"
+        )
+        nx.set_node_attributes(self.Graph, self._person_roles, "roles")
+
+        # Flat node -> label table, cheaper than NetworkX attribute dicts in loops
+        self.node_label = {
+            node: data.get("label") for node, data in self.Graph.nodes(data=True)
+        }
 
-            for actor in actor_nodes:
-                for director in director_nodes:
-                    self.Graph.add_edge(
-                        actor, director, relation="ACTOR_WORKED_WITH_DIRECTOR"
-                    )
-                    self.Graph.add_edge(
-                        director, actor, relation="DIRECTOR_WORKED_WITH_ACTOR"
-                    )
+        # Person -> movies table for constant-time filtering by person
+        self.person_movies = {
+            name: frozenset(movies) for name, movies in person_movies.items()
+        }
 
         print(
             f"Graph built with {self.Graph.number_of_nodes()} nodes and {self.Graph.number_of_edges()} edges"
         )
 
+    def _vid(self, name):
+        """Vertex id of a date/genre/person name, assigned on first sight."""
+        vertex = self._name_to_id.get(name)
+        if vertex is None:
+            vertex = self._name_to_id[name] = ~len(self._id_to_name)
+            self._id_to_name.append(name)
+        return vertex
+
+    def _vertex(self, node):
+        """Vertex for a movie id or a node name, or None if not in the graph."""
+        if isinstance(node, str):
+            return self._name_to_id.get(node)
+        return node if self.node_label.get(node) == "movie" else None
+
+    def _name(self, vertex):
+        """Public node key (movie id or name) of a vertex."""
+        return self._id_to_name[~vertex] if vertex < 0 else vertex
+
+    def node_data(self, node):
+        """Attributes of a graph node; movie attributes come from movie_attrs."""
+        if self.node_label[node] == "movie":
+            return {"label": "movie", **self.movie_attrs.loc[node].to_dict()}
+        return self.Graph.nodes[node]
+
+    def save(self, graph_path):
+        state = {attr: getattr(self, attr) for attr in _CACHED_ATTRS}
+        state["version"] = _CACHE_VERSION
+
+        # Written aside and swapped in, so an interrupted save never leaves a
+        # truncated file that looks fresher than the CSVs. Protocol 5 pickles
+        # the DataFrame's NumPy buffers without extra copies.
+        tmp_path = f"{graph_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(state, f, protocol=5)
+        os.replace(tmp_path, graph_path)
+
+        print("Graph file saved/updated.")
+
+    def load(self, graph_path):
+        """Restore a saved graph; False if the file is unreadable or outdated."""
+        try:
+            with open(graph_path, "rb") as f:
+                state = pickle.load(f)
+        except (pickle.UnpicklingError, EOFError) as e:
+            print(f"Graph file is corrupt ({e}), rebuilding.")
+            return False
+
+        if state.pop("version", None) != _CACHE_VERSION:
+            print("Graph file is outdated, rebuilding.")
+            return False
+        self.__dict__.update(state)
+
+        print(
+            f"Graph loaded with {self.Graph.number_of_nodes()} nodes and {self.Graph.number_of_edges()} edges"
+        )
+        return True
+
+    def _cache_is_fresh(self):
+        if not os.path.exists(self.graph_cache_file):
+            return False
+        # Missing CSVs mean the cache was shipped on its own, so it is used as is
+        cache_mtime = os.path.getmtime(self.graph_cache_file)
+        return all(
+            os.path.getmtime(path) <= cache_mtime
+            for path in DATA_FILES
+            if os.path.exists(path)
+        )
+
     def query_movie_id(self, movie_id: int):
-        if movie_id not in self.Graph:
+        vertex = self._vertex(movie_id)
+        if vertex is None:
             return None
 
-        return self.Graph.nodes[movie_id]
+        return self.node_data(vertex)
 
     def query_entity_graph(self, entity, relation=None):
-        if isinstance(entity, int) and entity in self.Graph.nodes:
+        if isinstance(entity, int) and self._vertex(entity) is not None:
             entity_ids = [entity]
         else:
             entity = entity.strip().lower()
 
-            entity_ids = []
-            matches = self.movies_df[
-                self.movies_df["title"].str.lower() == entity.lower()
-            ]
+            entity_ids = self._title_index.get(entity)
 
-            if not matches.empty:
-                entity_ids = matches["id"].tolist()
-            elif entity in self.Graph.nodes:
-                entity_ids = [entity]
-            else:
-                return []
+            if entity_ids is None:
+                vertex = self._name_to_id.get(entity)
+                if vertex is None:
+                    return []
+                entity_ids = [vertex]
 
         results = []
         for eid in entity_ids:
             if eid not in self.Graph:
                 continue
-            node_data = self.Graph.nodes[eid]
-            neighbors = []
-            for nbr, edges in self.Graph[eid].items():
-                for _, edge_data in edges.items():
-                    rel = edge_data.get("relation")
-                    if relation and rel != relation:
-                        continue
-                    neighbors.append({"neighbor": nbr, "relation": rel})
+            node_data = self.node_data(eid)
+            adjacency = self.Graph[eid]
+            if relation:
+                # One set membership test per neighbor instead of a scan
+                neighbors = [
+                    {"neighbor": self._name(nbr), "relation": relation}
+                    for nbr, edge_data in adjacency.items()
+                    if relation in edge_data["relations"]
+                ]
+            else:
+                neighbors = [
+                    {"neighbor": self._name(nbr), "relation": rel}
+                    for nbr, edge_data in adjacency.items()
+                    for rel in sorted(edge_data["relations"])
+                ]
 
             results.append(
                 {
-                    "node": eid,
+                    "node": self._name(eid),
                     "label": node_data.get("label"),
                     "node_data": node_data,
                     "neighbors": neighbors,
@@ -175,39 +473,31 @@ class MovieGraph:
             - Full node metadata
             - Relation to next node
         """
-        if node1 not in self.Graph or node2 not in self.Graph:
+        source, target = self._vertex(node1), self._vertex(node2)
+        if source is None or target is None:
             return []
 
-        paths = list(
-            nx.all_simple_paths(self.Graph, source=node1, target=node2, cutoff=max_len)
-        )
         result = []
 
-        for path in paths:
+        for path in self._cached_all_paths(source, target, max_len):
             path_data = []
             for i, node in enumerate(path):
-                node_info = self.Graph.nodes[node]
+                label = self.node_label[node]
                 node_dict = {
-                    "node": node,
-                    "label": node_info.get("label"),
+                    "node": self._name(node),
+                    "label": label,
                     "title": (
-                        node_info.get("title")
-                        if node_info.get("label") == "movie"
-                        else None
+                        self.movie_attrs.at[node, "title"] if label == "movie" else None
                     ),
                     "roles": (
-                        node_info.get("roles")
-                        if node_info.get("label") == "person"
+                        self.Graph.nodes[node].get("roles")
+                        if label == "person"
                         else None
                     ),
                 }
 
                 if i < len(path) - 1:
-                    edge_infos = self.Graph[node][path[i + 1]]
-                    relations = [
-                        edata.get("relation") for _, edata in edge_infos.items()
-                    ]
-                    node_dict["relation_to_next"] = relations
+                    node_dict.update(self._hop(node, path[i + 1]))
 
                 path_data.append(node_dict)
             result.append(path_data)
@@ -216,33 +506,55 @@ class MovieGraph:
 
     def shortest_path_query(self, source, target):
         """Return the shortest path between two nodes if exists."""
-        if source not in self.Graph or target not in self.Graph:
+        source, target = self._vertex(source), self._vertex(target)
+        if source is None or target is None:
             return None
-        try:
-            path = nx.shortest_path(self.Graph, source=source, target=target)
 
-            # Attach relation info
-            path_with_rels = []
-            for i, node in enumerate(path):
-                node_info = self.Graph.nodes[node]
-                node_dict = {
-                    "node": node,
-                    "label": node_info.get("label"),
-                    "title": (
-                        node_info.get("title")
-                        if node_info.get("label") == "movie"
-                        else None
-                    ),
-                }
-                if i < len(path) - 1:
-                    edge_infos = self.Graph[node][path[i + 1]]
-                    relations = [
-                        edata.get("relation") for _, edata in edge_infos.items()
-                    ]
-                    node_dict["relation_to_next"] = relations
-                path_with_rels.append(node_dict)
+        path = self._cached_shortest_path(source, target)
+        if path is None:
+            return None
 
-            return path_with_rels
+        # Attach relation info
+        path_with_rels = []
+        for i, node in enumerate(path):
+            label = self.node_label[node]
+            node_dict = {
+                "node": self._name(node),
+                "label": label,
+                "title": (
+                    self.movie_attrs.at[node, "title"] if label == "movie" else None
+                ),
+            }
+            if i < len(path) - 1:
+                node_dict.update(self._hop(node, path[i + 1]))
+            path_with_rels.append(node_dict)
+
+        return path_with_rels
+
+    def _hop(self, u, v):
+        """Relations from u to v, plus shared movies on actor/director hops."""
+        edge_data = self.Graph[u][v]
+        hop = {"relation_to_next": sorted(edge_data["relations"])}
+        if "movies" in edge_data:
+            hop["shared_movies"] = [
+                self.movie_attrs.at[movie_id, "title"]
+                for movie_id in sorted(edge_data["movies"])
+            ]
+        return hop
+
+    def _all_simple_paths(self, source, target, max_len):
+        # Splitting only pays off once both halves have at least one hop
+        if max_len <= 2:
+            return tuple(
+                tuple(path)
+                for path in nx.all_simple_paths(
+                    self.Graph, source=source, target=target, cutoff=max_len
+                )
+            )
+        return tuple(_bi_bounded_paths(self.Graph, source, target, max_len))
 
+    def _shortest_path_nodes(self, source, target):
+        try:
+            return tuple(nx.shortest_path(self.Graph, source=source, target=target))
         except nx.NetworkXNoPath:
             return None